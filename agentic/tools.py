@@ -1,24 +1,82 @@
+import pandas as pd
 import polars as pl
 from sqlalchemy import text
 
-from db.connection import get_engine
+import config
+from db import local_engine
+from db.connection import async_connect, connect
+from db.dtypes import rows_to_frame
+from db.snapshot import read_table  # noqa: F401  (re-exported for generated code)
 from langchain_experimental.tools.python.tool import PythonREPLTool
 
 python_repl_tool = PythonREPLTool()  # fine to keep even if unused
 
 
-def run_sql_pl(query: str) -> pl.DataFrame:
+def _maybe_lazy(df: pl.DataFrame, lazy: bool | None) -> pl.DataFrame | pl.LazyFrame:
+    if lazy is None:
+        lazy = config.LAZY_EXEC
+    return df.lazy() if lazy else df
+
+
+def _run_local(query: str, lazy: bool | None) -> pl.DataFrame | pl.LazyFrame:
+    if lazy is None:
+        lazy = config.LAZY_EXEC
+    lf = local_engine.execute(query)
+    return lf if lazy else lf.collect()
+
+
+def run_sql_pl(query: str, lazy: bool | None = None) -> pl.DataFrame | pl.LazyFrame:
     """
     Run a SQL query against Postgres and return the result as a Polars DataFrame.
+
+    With config.SQL_BACKEND = "local" the query runs in-process on Polars SQL
+    over data/raw instead (see db.local_engine), with the same tables and dtypes.
+
+    Repo-name columns come back as `pl.Categorical` and `state` as a
+    `pl.Enum` (see db.dtypes.compact_frame). With `lazy=True` (default:
+    config.LAZY_EXEC) a `pl.LazyFrame` is returned instead, so the caller's
+    Polars pipeline is optimised and run multi-threaded on `.collect()`.
     """
-    engine = get_engine()
-    with engine.connect() as conn:
+    if config.SQL_BACKEND == "local":
+        return _run_local(query, lazy)
+
+    with connect() as conn:
         result = conn.execute(text(query))
+        columns = list(result.keys())
         rows = result.fetchall()
 
-    if not rows:
-        return pl.DataFrame()
+    return _maybe_lazy(rows_to_frame(rows, columns), lazy)
+
+
+async def run_sql_pl_async(query: str, lazy: bool | None = None) -> pl.DataFrame | pl.LazyFrame:
+    """
+    Async variant of `run_sql_pl` on the asyncpg engine, so concurrent agent
+    runs and batch jobs can overlap database round trips:
 
-    # Convert each SQLAlchemy row to a dict of column -> value
-    dict_rows = [dict(r._mapping) for r in rows]
-    return pl.DataFrame(dict_rows)
+        frames = await asyncio.gather(*(run_sql_pl_async(q) for q in queries))
+    """
+    if config.SQL_BACKEND == "local":
+        return _run_local(query, lazy)
+
+    async with async_connect() as conn:
+        result = await conn.execute(text(query))
+        columns = list(result.keys())
+        rows = result.fetchall()
+
+    return _maybe_lazy(rows_to_frame(rows, columns), lazy)
+
+
+def to_pandas(df: pl.DataFrame | pl.LazyFrame, arrow_dtypes: bool = False) -> pd.DataFrame:
+    """
+    Convert a Polars result to Pandas at the plotting / markdown boundary,
+    collecting it first if it is still lazy.
+
+    The conversion goes through Arrow into ordinary NumPy-backed columns,
+    which copies the data (pyarrow consolidates it into Pandas blocks).
+    `arrow_dtypes=True` instead keeps every column as a pyarrow-backed
+    extension array that shares the Polars buffers, which suits
+    `.to_markdown()` but not every plotting / forecasting library.
+    """
+    if isinstance(df, pl.LazyFrame):
+        df = df.collect()
+    return df.to_pandas(use_pyarrow_extension_array=arrow_dtypes)
@@ -14,9 +14,10 @@ from langchain_core.messages import HumanMessage, SystemMessage
 from langchain_openai import ChatOpenAI
 from langgraph.graph import START, END, StateGraph
 
-from agentic.tools import run_sql_pl
+import config
+from agentic.tools import read_table, run_sql_pl, to_pandas
 
-SYSTEM_PROMPT = """
+_PANDAS_RULES = """
 You are a senior data analyst working with GitHub repository statistics
 stored in a PostgreSQL database.
 
@@ -30,8 +31,8 @@ which returns a Polars DataFrame for a given SQL query.
 IMPORTANT DATAFRAME RULES (CRITICAL):
 
 1. `run_sql_pl` returns a **Polars DataFrame**.
-2. Immediately after **every** call to `run_sql_pl`, you MUST convert it
-   to a Pandas DataFrame:
+2. Immediately after **every** call to `run_sql_pl` (or `read_table`, which
+   also returns a Polars DataFrame), you MUST convert it to a Pandas DataFrame:
 
        df = run_sql_pl(...)
        df = df.to_pandas()
@@ -39,6 +40,9 @@ IMPORTANT DATAFRAME RULES (CRITICAL):
 3. After that, do **all further processing in Pandas**, not Polars:
    - Do NOT use `pl.col`, `df.with_columns`, or other Polars Expr APIs.
    - You MAY use `.apply`, `.map`, `.pivot_table`, etc. on the Pandas DataFrame.
+4. `repo_full_name` and `state` columns arrive as Pandas `category` dtype.
+   Pass `observed=True` to `groupby` / `pivot_table` on them, and use
+   `.astype(str)` if you need plain strings.
 
 Example pattern:
 
@@ -47,7 +51,58 @@ Example pattern:
     df["my_col"] = df["my_col"].astype(int)
     pivot = df.pivot_table(...)
     answer_str = pivot.to_markdown()
+"""
+
+_POLARS_RULES = """
+You are a senior data analyst working with GitHub repository statistics
+stored in a PostgreSQL database.
+
+You have access to two helper functions:
+
+    from agentic.tools import run_sql_pl, to_pandas
+    lf = run_sql_pl("<SQL query>")
+    pdf = to_pandas(df_or_lf)
+
+`run_sql_pl` returns a Polars LazyFrame for a given SQL query, and
+`to_pandas` collects a Polars LazyFrame / DataFrame and converts it to Pandas.
+
+IMPORTANT DATAFRAME RULES (CRITICAL):
+
+1. `run_sql_pl` returns a **Polars LazyFrame**.
+2. Do **all processing in Polars expressions** on the LazyFrame and call
+   `.collect()` once, at the end of the pipeline:
+   - filter / derive with `.filter(...)`, `.with_columns(...)`, `pl.col(...)`
+   - aggregate with `.group_by(...).agg(pl.len().alias("n"), ...)`
+   - day of week: `pl.col("created_at").dt.weekday()` (1 = Monday ... 7 = Sunday)
+     or `.dt.strftime("%A")` for the name
+   - date buckets: `pl.col("created_at").dt.truncate("1d")` (or "1w", "1mo")
+   - sort with `.sort(...)`
+3. `.pivot(...)` only exists on DataFrames: collect first, then
+   `df.pivot(on="...", index="...", values="...", aggregate_function="sum")`.
+4. Do NOT call `.to_pandas()` on intermediate results and do NOT use Pandas
+   for grouping or pivoting. Convert only at the boundary:
+   - markdown tables: `answer_str = to_pandas(result).to_markdown(index=False)`
+   - charts / Prophet / statsmodels: `pdf = to_pandas(result)`, then plot or fit.
+5. `repo_full_name` is `pl.Categorical` and `state` is `pl.Enum`; compare them
+   with plain strings (`pl.col("state") == "closed"`) and use
+   `.cast(pl.String)` if you need plain strings.
+
+Example pattern:
+
+    lf = run_sql_pl(\"\"\"SELECT repo_full_name, created_at FROM issues\"\"\")
+    result = (
+        lf.with_columns(pl.col("created_at").dt.strftime("%A").alias("weekday"))
+        .group_by("repo_full_name", "weekday")
+        .agg(pl.len().alias("n"))
+        .collect()
+        .pivot(on="weekday", index="repo_full_name", values="n")
+    )
+    answer_str = to_pandas(result).to_markdown(index=False)
+"""
 
+
+def _prompt_body(tools_import: str) -> str:
+    return f"""
 The database contains:
 
 - repos(full_name, owner, name, stars, forks, open_issues, watchers, fetched_at)
@@ -55,6 +110,13 @@ The database contains:
 - pulls(id, repo_full_name, number, state, created_at, closed_at, merged_at)
 - commits(id, repo_full_name, sha, committed_at)
 
+`state` is always either 'open' or 'closed'.
+
+When you need a whole table with no SQL filtering, joins or aggregation,
+`read_table("issues")` (also from agentic.tools; one of repos, issues,
+pulls, commits) returns the same columns as `run_sql_pl("SELECT * FROM issues")`
+from a shared local snapshot without a database round trip.
+
 When the user asks a question, you MUST:
 
 1. Respond ONLY with a single Python code block, fenced with ```python ... ```.
@@ -64,7 +126,7 @@ When the user asks a question, you MUST:
    - import matplotlib.pyplot as plt
    - from prophet import Prophet
    - import statsmodels.api as sm
-   - from agentic.tools import run_sql_pl
+   - {tools_import}
 3. Use run_sql_pl() for all SQL queries.
 4. You can write any additional helper functions inside the code, but:
    - Do NOT include plain-English headings like "Query to get ..." as bare
@@ -93,6 +155,26 @@ When the user asks a question, you MUST:
    model. Never let the code crash due to too few data points.
 """
 
+
+SYSTEM_PROMPT = _PANDAS_RULES + _prompt_body("from agentic.tools import run_sql_pl, read_table")
+
+# Used when config.LAZY_EXEC is set: run_sql_pl returns a LazyFrame and the
+# code stays in Polars until the plotting / markdown boundary.
+LAZY_SYSTEM_PROMPT = _POLARS_RULES + _prompt_body("from agentic.tools import run_sql_pl, read_table, to_pandas")
+
+# Appended when config.SQL_BACKEND == "local" (Polars SQL instead of PostgreSQL)
+LOCAL_SQL_NOTE = """
+10. SQL runs on an embedded Polars SQL engine, not PostgreSQL. Keep queries to
+    SELECT / WHERE / GROUP BY / ORDER BY / JOIN with COUNT, SUM, AVG, MIN, MAX,
+    and always alias aggregates (`COUNT(*) AS n`).
+    Do NOT use TO_CHAR, DATE_TRUNC, NOW() or INTERVAL.
+    GROUP BY only works on plain columns (by name or position) or casts like
+    `created_at::date`. Do NOT GROUP BY a computed expression such as
+    DATE_PART('dow', created_at) or EXTRACT(...), nor by a select alias:
+    compute it in a subquery and group by its name in the outer query, or
+    do day-of-week and date bucketing in dataframe code after run_sql_pl.
+"""
+
 class AgentState(TypedDict):
     question: str
     messages: List
@@ -120,7 +202,8 @@ def _extract_code_block(text: str) -> str:
 def _run_code_in_repl(code: str) -> str:
     """
     Execute the generated Python code in a controlled namespace that
-    has pl, pd, plt, sm, Prophet, and run_sql_pl available.
+    has pl, pd, plt, sm, Prophet, run_sql_pl, read_table and to_pandas
+    available.
 
     Returns the string value of answer_str if present, otherwise any
     printed output, or an error message including the generated code.
@@ -132,6 +215,8 @@ def _run_code_in_repl(code: str) -> str:
         "sm": sm,
         "Prophet": Prophet,
         "run_sql_pl": run_sql_pl,
+        "to_pandas": to_pandas,
+        "read_table": read_table,
     }
 
     try:
@@ -166,10 +251,13 @@ def _run_code_in_repl(code: str) -> str:
 
 def build_graph():
     llm = ChatOpenAI(model="gpt-4o-mini", temperature=0)
+    system_prompt = LAZY_SYSTEM_PROMPT if config.LAZY_EXEC else SYSTEM_PROMPT
+    if config.SQL_BACKEND == "local":
+        system_prompt += LOCAL_SQL_NOTE
 
     def run_node(state: AgentState) -> AgentState:
         messages = [
-            SystemMessage(content=SYSTEM_PROMPT),
+            SystemMessage(content=system_prompt),
             HumanMessage(content=state["question"]),
         ]
         response = llm.invoke(messages)
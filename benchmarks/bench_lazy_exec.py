@@ -0,0 +1,145 @@
+"""
+Benchmark the Pandas execution mode against the Polars lazy mode (config.LAZY_EXEC)
+on the day-of-week and time-series quick queries.
+
+The input is synthetic: data/raw/issues.csv replicated SCALE times with
+created_at / closed_at shifted by up to half the original date span, shaped like a
+run_sql_pl result (Categorical repo, Enum state, UTC timestamps). The
+database round trip is the same for both modes and is left out; what is
+measured is everything the generated code does after run_sql_pl returns.
+
+    python -m benchmarks.bench_lazy_exec [--scale 100] [--repeat 5]
+"""
+import argparse
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import polars as pl
+
+from db.dtypes import compact_frame
+
+RAW_DIR = Path(__file__).parents[1] / "data" / "raw"
+WEEKDAYS = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"]
+
+
+def synthetic_issues(scale: int, seed: int = 0) -> pl.DataFrame:
+    base = pl.read_csv(RAW_DIR / "issues.csv", try_parse_dates=True).with_columns(
+        pl.col("created_at", "closed_at").cast(pl.Datetime("us", "UTC"))
+    )
+    rng = np.random.default_rng(seed)
+    n = base.height * scale
+    span_us = int(
+        (base["created_at"].max() - base["created_at"].min()).total_seconds() * 1_000_000
+    )
+    jitter = pl.Series(rng.integers(-span_us // 2, span_us // 2, n)).cast(pl.Duration("us"))
+
+    df = pl.concat([base] * scale).with_columns(
+        pl.int_range(pl.len()).alias("id"),
+        (pl.col("created_at") + jitter).alias("created_at"),
+        (pl.col("closed_at") + jitter).alias("closed_at"),
+    )
+    return compact_frame(df)
+
+
+# ------------------------
+# Q6.2 - issues per repo per day of week (table)
+# ------------------------
+def dow_pivot_pandas(df: pl.DataFrame) -> pd.DataFrame:
+    pdf = df.to_pandas()
+    pdf["weekday"] = pdf["created_at"].dt.day_name()
+    pivot = pdf.pivot_table(
+        index="repo_full_name", columns="weekday", values="id", aggfunc="count", observed=True
+    )
+    return pivot.reindex(columns=WEEKDAYS).fillna(0).astype(int)
+
+
+def dow_pivot_polars(lf: pl.LazyFrame) -> pd.DataFrame:
+    result = (
+        lf.group_by("repo_full_name", pl.col("created_at").dt.weekday().alias("dow"))
+        .agg(pl.len().alias("n"))
+        .sort("dow")
+        .with_columns(pl.col("dow").replace_strict(list(range(1, 8)), WEEKDAYS).alias("weekday"))
+        .collect()
+        .pivot(on="weekday", index="repo_full_name", values="n")
+        .fill_null(0)
+    )
+    return result.to_pandas()
+
+
+# ------------------------
+# Q6.4 - issues closed per day of week, all repos (table)
+# ------------------------
+def dow_closed_pandas(df: pl.DataFrame) -> pd.DataFrame:
+    pdf = df.to_pandas()
+    closed = pdf.dropna(subset=["closed_at"])
+    counts = closed["closed_at"].dt.day_name().value_counts()
+    return counts.reindex(WEEKDAYS).rename("n").reset_index()
+
+
+def dow_closed_polars(lf: pl.LazyFrame) -> pd.DataFrame:
+    result = (
+        lf.filter(pl.col("closed_at").is_not_null())
+        .group_by(pl.col("closed_at").dt.weekday().alias("dow"))
+        .agg(pl.len().alias("n"))
+        .sort("dow")
+        .collect()
+    )
+    return result.to_pandas()
+
+
+# ------------------------
+# Q7.1 - total issues created per day (line chart input)
+# ------------------------
+def daily_series_pandas(df: pl.DataFrame) -> pd.DataFrame:
+    pdf = df.to_pandas()
+    series = pdf.groupby(pdf["created_at"].dt.floor("D")).size()
+    return series.rename("n").reset_index()
+
+
+def daily_series_polars(lf: pl.LazyFrame) -> pd.DataFrame:
+    result = (
+        lf.group_by(pl.col("created_at").dt.truncate("1d").alias("day"))
+        .agg(pl.len().alias("n"))
+        .sort("day")
+        .collect()
+    )
+    return result.to_pandas()
+
+
+CASES = {
+    "Q6.2 issues per repo x weekday": (dow_pivot_pandas, dow_pivot_polars),
+    "Q6.4 issues closed per weekday": (dow_closed_pandas, dow_closed_polars),
+    "Q7.1 issues created per day": (daily_series_pandas, daily_series_polars),
+}
+
+
+def _best_of(fn, arg, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn(arg)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Pandas vs Polars lazy execution mode")
+    parser.add_argument("--scale", type=int, default=100)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    df = synthetic_issues(args.scale)
+    print(f"{df.height:,} synthetic issue rows ({args.scale}x data/raw/issues.csv)\n")
+    print(f"| {'query':<32} | pandas (ms) | polars lazy (ms) | speedup |")
+    print(f"|{'-' * 34}|-------------|------------------|---------|")
+
+    for name, (pandas_fn, polars_fn) in CASES.items():
+        t_pd = _best_of(pandas_fn, df, args.repeat)
+        t_pl = _best_of(polars_fn, df.lazy(), args.repeat)
+        print(f"| {name:<32} | {t_pd * 1e3:11.1f} | {t_pl * 1e3:16.1f} | {t_pd / t_pl:6.1f}x |")
+
+
+if __name__ == "__main__":
+    main()
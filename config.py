@@ -10,6 +10,18 @@ GITHUB_REPOS = [
     "milvus-io/pymilvus",
 ]
 
+# Optional, to track more repos than the list above (see github_pipeline/repo_list.py):
+# - a file with one "owner/repo" per line ('#' starts a comment)
+# - comma-separated orgs and/or topics to discover repos from
+GITHUB_REPOS_FILE = os.getenv("GITHUB_REPOS_FILE", "")
+GITHUB_ORGS = [o.strip() for o in os.getenv("GITHUB_ORGS", "").split(",") if o.strip()]
+GITHUB_TOPICS = [t.strip() for t in os.getenv("GITHUB_TOPICS", "").split(",") if t.strip()]
+# Upper bound on repos discovered per org / topic
+GITHUB_DISCOVERY_LIMIT = int(os.getenv("GITHUB_DISCOVERY_LIMIT", "200"))
+
+# Worker processes used by github_pipeline.crawl
+CRAWL_WORKERS = int(os.getenv("GITHUB_CRAWL_WORKERS", "4"))
+
 # Last 60 days window
 DAYS_BACK = 60
 SINCE_DATE = (datetime.utcnow() - timedelta(days=DAYS_BACK)).isoformat() + "Z"
@@ -25,6 +37,22 @@ POSTGRES_PORT = int(os.getenv("BA1_PG_PORT", "5432"))
 
 OPENAI_API_KEY = os.getenv("OPENAI_API_KEY", "")
 
+# Where run_sql_pl runs SQL: "postgres" (PG_DSN) or "local" (in-process Polars SQL
+# over the CSVs in data/raw, see db/local_engine.py; no database needed)
+SQL_BACKEND = os.getenv("BA1_SQL_BACKEND", "postgres")
+
+# Opt-in: run_sql_pl returns a pl.LazyFrame and generated code stays in Polars
+# until the plotting / markdown boundary (see agentic/workflow.py)
+LAZY_EXEC = os.getenv("BA1_LAZY_EXEC", "0") == "1"
+
+# Versioned Arrow IPC snapshots of the analytics tables (see db/snapshot.py)
+SNAPSHOT_DIR = os.getenv(
+    "BA1_SNAPSHOT_DIR",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "snapshots"),
+)
+# Older snapshot versions kept on disk after a new one goes live
+SNAPSHOT_KEEP = int(os.getenv("BA1_SNAPSHOT_KEEP", "2"))
+
 # Convenience DSN
 PG_DSN = (
     f"postgresql+psycopg2://{POSTGRES_USER}:{POSTGRES_PASSWORD}"
@@ -32,3 +60,21 @@ PG_DSN = (
     "?sslmode=require"
 )
 
+# Async variant of the DSN (asyncpg takes `ssl` instead of `sslmode`)
+PG_ASYNC_DSN = (
+    f"postgresql+asyncpg://{POSTGRES_USER}:{POSTGRES_PASSWORD}"
+    f"@{POSTGRES_HOST}:{POSTGRES_PORT}/{POSTGRES_DB}"
+    "?ssl=require"
+)
+
+# --- Connection pool tuning (shared by the sync and async engines) ---
+PG_POOL_SIZE = int(os.getenv("BA1_PG_POOL_SIZE", "5"))
+PG_MAX_OVERFLOW = int(os.getenv("BA1_PG_MAX_OVERFLOW", "10"))
+PG_POOL_TIMEOUT = float(os.getenv("BA1_PG_POOL_TIMEOUT", "30"))
+# Recycle connections before server / proxy idle timeouts drop them (seconds)
+PG_POOL_RECYCLE = int(os.getenv("BA1_PG_POOL_RECYCLE", "1800"))
+PG_POOL_PRE_PING = os.getenv("BA1_PG_POOL_PRE_PING", "1") == "1"
+# Open this many connections up front so the first questions skip the SSL handshake
+PG_POOL_WARMUP = int(os.getenv("BA1_PG_POOL_WARMUP", str(PG_POOL_SIZE)))
+# SQLAlchemy compiled-statement cache and asyncpg prepared-statement cache sizes
+PG_STATEMENT_CACHE_SIZE = int(os.getenv("BA1_PG_STATEMENT_CACHE_SIZE", "500"))
@@ -1,17 +1,196 @@
-from sqlalchemy import create_engine, text
-from sqlalchemy.engine import Engine
-from config import PG_DSN
+import threading
+import time
+
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine, create_async_engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+from config import (
+    PG_ASYNC_DSN,
+    PG_DSN,
+    PG_MAX_OVERFLOW,
+    PG_POOL_PRE_PING,
+    PG_POOL_RECYCLE,
+    PG_POOL_SIZE,
+    PG_POOL_TIMEOUT,
+    PG_POOL_WARMUP,
+    PG_STATEMENT_CACHE_SIZE,
+)
 
 _engine: Engine | None = None
+_async_engine: AsyncEngine | None = None
+
+POOL_KWARGS = dict(
+    pool_size=PG_POOL_SIZE,
+    max_overflow=PG_MAX_OVERFLOW,
+    pool_timeout=PG_POOL_TIMEOUT,
+    pool_recycle=PG_POOL_RECYCLE,
+    pool_pre_ping=PG_POOL_PRE_PING,
+    query_cache_size=PG_STATEMENT_CACHE_SIZE,
+)
+
+
+# ------------------------
+# Pool metrics
+# ------------------------
+class PoolMetrics:
+    """Thread-safe counters for one engine's pool."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.connects = 0
+        self.checkouts = 0
+        self.checkins = 0
+        self.wait_count = 0
+        self.wait_total_s = 0.0
+        self.wait_max_s = 0.0
+
+    def _incr(self, name: str) -> None:
+        with self._lock:
+            setattr(self, name, getattr(self, name) + 1)
+
+    def record_wait(self, seconds: float) -> None:
+        with self._lock:
+            self.wait_count += 1
+            self.wait_total_s += seconds
+            self.wait_max_s = max(self.wait_max_s, seconds)
+
+    def attach(self, engine: Engine) -> None:
+        """Count connect / checkout / checkin events on `engine`'s pool."""
+        event.listen(engine, "connect", lambda *_: self._incr("connects"))
+        event.listen(engine, "checkout", lambda *_: self._incr("checkouts"))
+        event.listen(engine, "checkin", lambda *_: self._incr("checkins"))
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                "connects": self.connects,
+                "checkouts": self.checkouts,
+                "checkins": self.checkins,
+                "wait_count": self.wait_count,
+                "wait_total_s": self.wait_total_s,
+                "wait_avg_s": self.wait_total_s / self.wait_count if self.wait_count else 0.0,
+                "wait_max_s": self.wait_max_s,
+            }
+
+
+_metrics = PoolMetrics()
+_async_metrics = PoolMetrics()
+
+
+class _QueueWaitTiming:
+    """
+    Pool mixin recording how long each checkout blocks on the pool's
+    idle-connection queue.
+
+    This is only the time spent waiting for a free pooled connection:
+    opening a new connection (SSL handshake) and the pre-ping round trip
+    happen outside the queue and are not counted.
+    """
+
+    _wait_metrics: PoolMetrics
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._untimed_get = self._pool.get
+        self._pool.get = self._timed_get
+
+    def _timed_get(self, *args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return self._untimed_get(*args, **kwargs)
+        finally:
+            self._wait_metrics.record_wait(time.perf_counter() - start)
 
+    def dispose(self) -> None:
+        # Draining idle connections is not a checkout
+        self._pool.get = self._untimed_get
+        try:
+            super().dispose()
+        finally:
+            self._pool.get = self._timed_get
 
+
+class _TimedQueuePool(_QueueWaitTiming, QueuePool):
+    _wait_metrics = _metrics
+
+
+class _TimedAsyncQueuePool(_QueueWaitTiming, AsyncAdaptedQueuePool):
+    _wait_metrics = _async_metrics
+
+
+def get_pool_metrics() -> dict:
+    """
+    Pool counters for the sync and async engines, plus the live pool status
+    (checked-out / idle / overflow connections) for engines already created.
+
+    `wait_*` is time spent queued for a free pooled connection only, not
+    connection setup or pre-ping.
+    """
+    out = {"sync": _metrics.snapshot(), "async": _async_metrics.snapshot()}
+    if _engine is not None:
+        out["sync"]["checked_out"] = _engine.pool.checkedout()
+        out["sync"]["status"] = _engine.pool.status()
+    if _async_engine is not None:
+        out["async"]["checked_out"] = _async_engine.pool.checkedout()
+        out["async"]["status"] = _async_engine.pool.status()
+    return out
+
+
+# ------------------------
+# Sync engine
+# ------------------------
 def get_engine() -> Engine:
     global _engine
     if _engine is None:
-        _engine = create_engine(PG_DSN, echo=False, future=True)
+        _engine = create_engine(
+            PG_DSN, echo=False, future=True, poolclass=_TimedQueuePool, **POOL_KWARGS
+        )
+        _metrics.attach(_engine)
     return _engine
 
 
+def connect() -> Connection:
+    """Pooled connection from the sync engine (use as a context manager)."""
+    return get_engine().connect()
+
+
+def warm_up_pool(n: int = PG_POOL_WARMUP) -> None:
+    """Open `n` pooled connections (capped at the pool size) and return them idle."""
+    n = min(n, PG_POOL_SIZE)
+    engine = get_engine()
+    conns = []
+    try:
+        for _ in range(n):
+            conns.append(engine.connect())
+    finally:
+        for conn in conns:
+            conn.close()
+
+
+# ------------------------
+# Async engine
+# ------------------------
+def get_async_engine() -> AsyncEngine:
+    global _async_engine
+    if _async_engine is None:
+        _async_engine = create_async_engine(
+            PG_ASYNC_DSN,
+            echo=False,
+            connect_args={"prepared_statement_cache_size": PG_STATEMENT_CACHE_SIZE},
+            poolclass=_TimedAsyncQueuePool,
+            **POOL_KWARGS,
+        )
+        _async_metrics.attach(_async_engine.sync_engine)
+    return _async_engine
+
+
+def async_connect() -> AsyncConnection:
+    """Async counterpart of `connect()` (use with `async with`)."""
+    return get_async_engine().connect()
+
+
 def init_db() -> None:
     """Create tables from schema.sql."""
     from pathlib import Path
@@ -0,0 +1,46 @@
+import polars as pl
+
+# Values of the `item_state` enum in schema.sql, in declaration order.
+ITEM_STATES = ("open", "closed")
+STATE_DTYPE = pl.Enum(list(ITEM_STATES))
+
+# Low-cardinality text columns that repeat across every issue / PR / commit row.
+CATEGORICAL_COLUMNS = ("repo_full_name", "full_name", "owner")
+
+
+def compact_frame(df: pl.DataFrame) -> pl.DataFrame:
+    """
+    Map repo-name columns to `Categorical` and `state` to an `Enum` so
+    in-memory frames (and their Arrow buffers) store small integer codes
+    instead of repeating the same strings on every row.
+
+    Columns are only touched when they are plain strings; a `state` column
+    holding anything outside ITEM_STATES is left as-is.
+    """
+    casts = [
+        pl.col(c).cast(pl.Categorical)
+        for c in CATEGORICAL_COLUMNS
+        if df.schema.get(c) == pl.String
+    ]
+
+    if df.schema.get("state") == pl.String:
+        states = df.get_column("state").drop_nulls()
+        if states.is_in(list(ITEM_STATES)).all():
+            casts.append(pl.col("state").cast(STATE_DTYPE))
+
+    return df.with_columns(casts) if casts else df
+
+
+def rows_to_frame(rows, columns: list[str]) -> pl.DataFrame:
+    """Build a compact frame from SQLAlchemy result rows and their column names."""
+    if not rows:
+        return pl.DataFrame()
+
+    # Transpose to columns instead of building one dict per row. (orient="row"
+    # would be simpler but drops the time zone of TIMESTAMPTZ values.)
+    df = pl.DataFrame(
+        [list(col) for col in zip(*rows)],
+        schema=columns,
+        orient="col",
+    )
+    return compact_frame(df)
@@ -0,0 +1,271 @@
+"""
+In-process SQL backend over the CSVs in data/raw (config.SQL_BACKEND = "local").
+
+Tables are built from lazily scanned CSVs into the same shape the
+Postgres compatibility views return through run_sql_pl: same table and
+column names and order, BIGINT/INT -> Int64, TIMESTAMPTZ -> Datetime(UTC),
+TIMESTAMP -> Datetime, repo names Categorical, state Enum. As in
+load_to_postgres, PRs are dropped from issues and rows for repos missing
+from repos.csv are dropped (the views join on repos).
+
+The tables are collected once and registered in a `pl.SQLContext`, so a
+query costs only Polars planning and execution, with no network round
+trip. They are rebuilt when any CSV changes on disk.
+
+Polars SQL covers the common PostgreSQL subset (SELECT / WHERE / GROUP BY /
+ORDER BY / JOIN, COUNT / SUM / AVG / MIN / MAX, `::date`, DATE_PART,
+STRFTIME) but not everything: TO_CHAR, DATE_TRUNC and NOW() are missing,
+and GROUP BY only accepts plain columns (by name or position) and casts
+such as `created_at::date`. Grouping by a computed expression like
+DATE_PART('dow', created_at), or by a select alias, fails; compute the
+expression in a subquery and group by its name in the outer query.
+
+Top-level select items that are a single unaliased aggregate call, such
+as COUNT(*) or AVG(stars), are given their PostgreSQL names (`count`,
+`sum`, `avg`, `min`, `max`) before running, also after a WITH clause.
+"""
+import re
+from datetime import datetime
+from pathlib import Path
+
+import polars as pl
+import polars.selectors as cs
+
+from db.dtypes import STATE_DTYPE
+
+RAW_DIR = Path(__file__).parents[1] / "data" / "raw"
+TABLES = ("repos", "issues", "pulls", "commits")
+
+_ctx: pl.SQLContext | None = None
+_mtimes: dict[str, float] = {}
+
+
+def _scan(
+    table: str,
+    ints: tuple[str, ...] = (),
+    bools: tuple[str, ...] = (),
+    dates: tuple[str, ...] = (),
+) -> pl.LazyFrame:
+    # Types are pinned rather than inferred so a header-only CSV (a crawl with
+    # no rows for it) keeps the view dtypes. Timestamps stay strings in the
+    # scan and are parsed here as UTC.
+    lf = pl.scan_csv(RAW_DIR / f"{table}.csv")
+    return lf.with_columns(
+        *(pl.col(c).cast(pl.Int64) for c in ints),
+        *(pl.col(c).cast(pl.Boolean) for c in bools),
+        *(pl.col(c).str.to_datetime(time_unit="us", time_zone="UTC") for c in dates),
+    )
+
+
+def _with_repo_name(lf: pl.LazyFrame, repos: pl.LazyFrame) -> pl.LazyFrame:
+    known = repos.select(pl.col("full_name").cast(pl.String).alias("repo_full_name"))
+    return lf.join(known, on="repo_full_name", how="semi").with_columns(
+        pl.col("repo_full_name").cast(pl.Categorical)
+    )
+
+
+def _tables() -> dict[str, pl.LazyFrame]:
+    """Lazy pipelines mirroring the repos table and the issues / pulls / commits views."""
+    fetched_at = datetime.fromtimestamp(_mtimes["repos"])
+    repos = _scan("repos", ints=("stars", "forks", "open_issues", "watchers")).select(
+        pl.int_range(1, pl.len() + 1, dtype=pl.Int64).alias("id"),
+        pl.col("full_name").cast(pl.Categorical),
+        pl.col("owner").cast(pl.Categorical),
+        "name",
+        "stars",
+        "forks",
+        "open_issues",
+        "watchers",
+        pl.lit(fetched_at, dtype=pl.Datetime("us")).alias("fetched_at"),
+    )
+
+    issues = (
+        _scan(
+            "issues",
+            ints=("id", "number"),
+            bools=("is_pull_request",),
+            dates=("created_at", "closed_at"),
+        )
+        .filter(~pl.col("is_pull_request"))
+        .pipe(_with_repo_name, repos)
+        .select(
+            "id",
+            "repo_full_name",
+            "number",
+            pl.col("state").cast(STATE_DTYPE),
+            "created_at",
+            "closed_at",
+            "is_pull_request",
+        )
+    )
+
+    pulls = (
+        _scan("pulls", ints=("id", "number"), dates=("created_at", "closed_at", "merged_at"))
+        .pipe(_with_repo_name, repos)
+        .select(
+            "id",
+            "repo_full_name",
+            "number",
+            pl.col("state").cast(STATE_DTYPE),
+            "created_at",
+            "closed_at",
+            "merged_at",
+        )
+    )
+
+    commits = (
+        _scan("commits", dates=("committed_at",))
+        .with_row_index("id", offset=1)
+        .pipe(_with_repo_name, repos)
+        .select(pl.col("id").cast(pl.Int64), "repo_full_name", "sha", "committed_at")
+    )
+
+    return {"repos": repos, "issues": issues, "pulls": pulls, "commits": commits}
+
+
+def data_mtime() -> float:
+    """Most recent modification time of the CSVs backing the local tables."""
+    return max((RAW_DIR / f"{t}.csv").stat().st_mtime for t in TABLES)
+
+
+def get_context() -> pl.SQLContext:
+    """SQLContext over the current CSVs, rebuilt when any of them changes."""
+    global _ctx
+    mtimes = {t: (RAW_DIR / f"{t}.csv").stat().st_mtime for t in TABLES}
+    if _ctx is None or mtimes != _mtimes:
+        _mtimes.clear()
+        _mtimes.update(mtimes)
+        frames = pl.collect_all(list(_tables().values()))
+        _ctx = pl.SQLContext(frames=dict(zip(TABLES, frames)))
+    return _ctx
+
+
+_AGGREGATE = re.compile(r"(count|sum|avg|min|max)\s*\(", re.IGNORECASE)
+# One CTE header up to its opening parenthesis: name [(columns)] AS [[NOT] MATERIALIZED] (
+_CTE = re.compile(
+    r'\s*[\w"]+\s*(\([^)]*\))?\s*as\s*(not\s+)?(materialized\s*)?\(', re.IGNORECASE
+)
+_CTE_SEPARATOR = re.compile(r"\s*(,)?\s*")
+_SELECT = re.compile(r"select\s+(distinct\s+)?", re.IGNORECASE)
+
+
+def _scan_sql(text: str, start: int = 0):
+    """Yield (index, char, depth) for characters outside quotes, from `start`."""
+    depth, quote = 0, None
+    for i in range(start, len(text)):
+        ch = text[i]
+        if quote:
+            if ch == quote:
+                quote = None
+        elif ch in "'\"":
+            quote = ch
+        elif ch == "(":
+            yield i, ch, depth
+            depth += 1
+        elif ch == ")":
+            depth -= 1
+            yield i, ch, depth
+        else:
+            yield i, ch, depth
+
+
+def _closing_paren(text: str, open_at: int) -> int | None:
+    """Index of the parenthesis closing the one at `open_at`."""
+    for i, ch, depth in _scan_sql(text, open_at):
+        if ch == ")" and depth == 0:
+            return i
+    return None
+
+
+def _split_top_level(text: str) -> list[str]:
+    """Split on commas outside parentheses and quotes."""
+    parts, start = [], 0
+    for i, ch, depth in _scan_sql(text):
+        if ch == "," and depth == 0:
+            parts.append(text[start:i])
+            start = i + 1
+    parts.append(text[start:])
+    return parts
+
+
+def _aggregate_name(item: str) -> str | None:
+    """
+    Postgres column name of `item` if it is a bare aggregate call such as
+    COUNT(*) or AVG(stars); None for anything else, including expressions
+    like COUNT(*) * 1.0 / SUM(stars).
+    """
+    m = _AGGREGATE.match(item)
+    if not m or _closing_paren(item, m.end() - 1) != len(item) - 1:
+        return None
+    return m.group(1).lower()
+
+
+def _main_select(query: str) -> int | None:
+    """Index of the top-level SELECT keyword, after any WITH clause."""
+    m = re.match(r"\s*with\s+(recursive\s+)?", query, re.IGNORECASE)
+    if not m:
+        m = re.match(r"\s*(?=select\b)", query, re.IGNORECASE)
+        return m.end() if m else None
+
+    # WITH name [(columns)] AS [[NOT] MATERIALIZED] (...), ... SELECT
+    pos = m.end()
+    while True:
+        cte = _CTE.match(query, pos)
+        close = _closing_paren(query, cte.end() - 1) if cte else None
+        if close is None:
+            return None
+        after = _CTE_SEPARATOR.match(query, close + 1)
+        pos = after.end()
+        if not after.group(1):
+            break
+    return pos if re.match(r"select\b", query[pos:], re.IGNORECASE) else None
+
+
+def _alias_aggregates(query: str) -> str:
+    """
+    Give unaliased top-level aggregates the column names Postgres would
+    (Polars names COUNT(*) "len" and AVG(stars) "stars"). Only items that
+    are a single aggregate call are renamed; queries whose main statement
+    is not a SELECT, or where two aggregates would share a name, are left
+    alone.
+    """
+    select_at = _main_select(query)
+    if select_at is None:
+        return query
+    m = _SELECT.match(query, select_at)
+    if not m:
+        return query
+
+    # End of the select list: first FROM outside parentheses / quotes
+    end = None
+    for i, ch, depth in _scan_sql(query, m.end()):
+        if depth == 0 and re.match(r"from\b", query[i:i + 5], re.IGNORECASE) and not (
+            query[i - 1].isalnum() or query[i - 1] == "_"
+        ):
+            end = i
+            break
+    if end is None:
+        return query
+
+    items = _split_top_level(query[m.end():end])
+    names = [_aggregate_name(item.strip()) for item in items]
+    given = [n for n in names if n]
+    if not given or len(given) != len(set(given)):
+        return query
+
+    items = [
+        f"{item.rstrip()} AS {name}{item[len(item.rstrip()):]}" if name else item
+        for item, name in zip(items, names)
+    ]
+    select_list = ",".join(items)
+    if not select_list[-1].isspace():
+        # e.g. "COUNT(*)FROM" -> "COUNT(*) AS count FROM"
+        select_list += " "
+    return query[: m.end()] + select_list + query[end:]
+
+
+def execute(query: str) -> pl.LazyFrame:
+    """Plan `query` against the local tables; nothing runs until `.collect()`."""
+    lf = get_context().execute(_alias_aggregates(query), eager=False)
+    # COUNT(*) and friends are UInt32 in Polars but BIGINT in Postgres
+    return lf.with_columns(cs.unsigned_integer().cast(pl.Int64))
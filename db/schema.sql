@@ -10,32 +10,119 @@ CREATE TABLE IF NOT EXISTS repos (
     fetched_at TIMESTAMP DEFAULT NOW()
 );
 
-CREATE TABLE IF NOT EXISTS issues (
+-- GitHub only ever reports these two states for issues and pull requests
+-- (merged PRs are "closed" with a non-null merged_at).
+DO $$
+BEGIN
+    CREATE TYPE item_state AS ENUM ('open', 'closed');
+EXCEPTION
+    WHEN duplicate_object THEN NULL;
+END $$;
+
+-- Storage tables: repo is a small integer FK into repos, state is an enum.
+
+CREATE TABLE IF NOT EXISTS issues_data (
     id BIGINT PRIMARY KEY,
-    repo_full_name TEXT,
+    repo_id INT NOT NULL REFERENCES repos (id),
     number INT,
-    state TEXT,
+    state item_state,
     created_at TIMESTAMPTZ,
     closed_at TIMESTAMPTZ,
     is_pull_request BOOLEAN
 );
 
-CREATE INDEX IF NOT EXISTS idx_issues_repo_created
-    ON issues (repo_full_name, created_at);
+CREATE INDEX IF NOT EXISTS idx_issues_data_repo_created
+    ON issues_data (repo_id, created_at);
 
-CREATE TABLE IF NOT EXISTS pulls (
+CREATE TABLE IF NOT EXISTS pulls_data (
     id BIGINT PRIMARY KEY,
-    repo_full_name TEXT,
+    repo_id INT NOT NULL REFERENCES repos (id),
     number INT,
-    state TEXT,
+    state item_state,
     created_at TIMESTAMPTZ,
     closed_at TIMESTAMPTZ,
     merged_at TIMESTAMPTZ
 );
 
-CREATE TABLE IF NOT EXISTS commits (
+CREATE INDEX IF NOT EXISTS idx_pulls_data_repo_created
+    ON pulls_data (repo_id, created_at);
+
+CREATE TABLE IF NOT EXISTS commits_data (
     id SERIAL PRIMARY KEY,
-    repo_full_name TEXT,
+    repo_id INT NOT NULL REFERENCES repos (id),
     sha TEXT,
     committed_at TIMESTAMPTZ
 );
+
+CREATE INDEX IF NOT EXISTS idx_commits_data_repo_committed
+    ON commits_data (repo_id, committed_at);
+
+-- Older databases stored issues / pulls / commits as plain tables keyed by
+-- repo_full_name TEXT. Rename them to *_legacy so the compatibility views
+-- below can take over their names, and copy their rows into the storage
+-- tables (rows whose repo is not in repos are dropped, as the views would).
+DO $$
+DECLARE
+    t TEXT;
+    moved TEXT[] := ARRAY[]::TEXT[];
+BEGIN
+    FOREACH t IN ARRAY ARRAY['issues', 'pulls', 'commits'] LOOP
+        IF EXISTS (
+            SELECT 1 FROM information_schema.tables
+            WHERE table_schema = current_schema()
+              AND table_name = t
+              AND table_type = 'BASE TABLE'
+        ) THEN
+            EXECUTE format('ALTER TABLE %I RENAME TO %I', t, t || '_legacy');
+            moved := moved || t;
+        END IF;
+    END LOOP;
+
+    IF 'issues' = ANY (moved) THEN
+        INSERT INTO issues_data
+            (id, repo_id, number, state, created_at, closed_at, is_pull_request)
+        SELECT l.id, r.id, l.number, l.state::item_state,
+               l.created_at, l.closed_at, l.is_pull_request
+        FROM issues_legacy l
+        JOIN repos r ON r.full_name = l.repo_full_name
+        ON CONFLICT (id) DO NOTHING;
+    END IF;
+
+    IF 'pulls' = ANY (moved) THEN
+        INSERT INTO pulls_data
+            (id, repo_id, number, state, created_at, closed_at, merged_at)
+        SELECT l.id, r.id, l.number, l.state::item_state,
+               l.created_at, l.closed_at, l.merged_at
+        FROM pulls_legacy l
+        JOIN repos r ON r.full_name = l.repo_full_name
+        ON CONFLICT (id) DO NOTHING;
+    END IF;
+
+    IF 'commits' = ANY (moved) THEN
+        INSERT INTO commits_data (repo_id, sha, committed_at)
+        SELECT r.id, l.sha, l.committed_at
+        FROM commits_legacy l
+        JOIN repos r ON r.full_name = l.repo_full_name
+        ORDER BY l.id;
+    END IF;
+END $$;
+
+-- Compatibility views: same names and columns as the original tables, so
+-- generated SQL (and SYSTEM_PROMPT) keep working unchanged.
+
+CREATE OR REPLACE VIEW issues AS
+SELECT i.id, r.full_name AS repo_full_name, i.number, i.state,
+       i.created_at, i.closed_at, i.is_pull_request
+FROM issues_data i
+JOIN repos r ON r.id = i.repo_id;
+
+CREATE OR REPLACE VIEW pulls AS
+SELECT p.id, r.full_name AS repo_full_name, p.number, p.state,
+       p.created_at, p.closed_at, p.merged_at
+FROM pulls_data p
+JOIN repos r ON r.id = p.repo_id;
+
+CREATE OR REPLACE VIEW commits AS
+SELECT c.id, r.full_name AS repo_full_name, c.sha, c.committed_at
+FROM commits_data c
+JOIN repos r ON r.id = c.repo_id;
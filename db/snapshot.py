@@ -0,0 +1,173 @@
+"""
+Versioned Arrow IPC snapshots of the analytics tables.
+
+`build_snapshot()` exports repos / issues / pulls / commits (through the
+compatibility views, so columns match what generated SQL sees) into
+
+    SNAPSHOT_DIR/<version>/<table>.arrow
+
+uncompressed, then flips SNAPSHOT_DIR/CURRENT to the new version. Both the
+directory rename and the CURRENT rewrite are atomic, so readers never see
+a half-written snapshot. The tables are read from the configured backend
+(config.SQL_BACKEND: Postgres, or the local engine over data/raw), which is
+recorded in <version>/SOURCE.
+
+`read_table()` memory-maps the current version's file. The OS page cache
+backs the mapping, so every worker process and session reads the same
+pages instead of holding its own copy; a reload is picked up on the next
+call after CURRENT changes. Only a snapshot built from the backend in use
+is served, so read_table returns what run_sql_pl would.
+
+    python -m db.snapshot      # rebuild from config.SQL_BACKEND
+"""
+import os
+import shutil
+from datetime import datetime, timezone
+from pathlib import Path
+
+import polars as pl
+from sqlalchemy import text
+
+import config
+from config import SNAPSHOT_DIR, SNAPSHOT_KEEP
+from db import local_engine
+from db.connection import connect
+from db.dtypes import rows_to_frame
+
+TABLES = ("repos", "issues", "pulls", "commits")
+
+_root = Path(SNAPSHOT_DIR)
+_current = _root / "CURRENT"
+
+# table -> (version, frame) for this process
+_loaded: dict[str, tuple[str, pl.DataFrame]] = {}
+
+
+def _select_all(table: str, source: str = "postgres") -> pl.DataFrame:
+    if source == "local":
+        return local_engine.execute(f"SELECT * FROM {table}").collect()
+    with connect() as conn:
+        result = conn.execute(text(f"SELECT * FROM {table}"))
+        columns = list(result.keys())
+        rows = result.fetchall()
+    return rows_to_frame(rows, columns)
+
+
+# ------------------------
+# Building
+# ------------------------
+def build_snapshot(source: str | None = None) -> str:
+    """
+    Export TABLES from `source` ("postgres" or "local"; default:
+    config.SQL_BACKEND) to a new snapshot version, make it current, and
+    return the version.
+    """
+    if source is None:
+        source = config.SQL_BACKEND
+    version = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%S%fZ")
+    _root.mkdir(parents=True, exist_ok=True)
+
+    staging = _root / f".{version}.tmp"
+    staging.mkdir()
+    try:
+        for table in TABLES:
+            # Uncompressed: compressed IPC buffers cannot be memory-mapped.
+            # Oldest compat level: plain Arrow strings rather than Polars'
+            # string views, which Polars 1.7 writes incorrectly next to
+            # dictionary (Categorical) columns.
+            _select_all(table, source).write_ipc(
+                staging / f"{table}.arrow",
+                compression="uncompressed",
+                compat_level=pl.CompatLevel.oldest(),
+            )
+        (staging / "SOURCE").write_text(source, encoding="utf-8")
+        os.replace(staging, _root / version)
+    except BaseException:
+        shutil.rmtree(staging, ignore_errors=True)
+        raise
+
+    pointer = _root / f".CURRENT.{version}.tmp"
+    pointer.write_text(version, encoding="utf-8")
+    os.replace(pointer, _current)
+
+    _prune(keep=version)
+    return version
+
+
+def _prune(keep: str) -> None:
+    """Drop all but the SNAPSHOT_KEEP most recent older versions."""
+    versions = sorted(
+        p.name for p in _root.iterdir() if p.is_dir() and not p.name.startswith(".")
+    )
+    older = [v for v in versions if v != keep]
+    stale = older[: max(len(older) - SNAPSHOT_KEEP, 0)]
+    for v in stale:
+        # Processes still mapping these files keep their pages until they
+        # re-read CURRENT (on POSIX an unlinked mapped file stays readable)
+        shutil.rmtree(_root / v, ignore_errors=True)
+
+
+# ------------------------
+# Reading
+# ------------------------
+def current_version() -> str | None:
+    try:
+        return _current.read_text(encoding="utf-8").strip() or None
+    except FileNotFoundError:
+        return None
+
+
+def _source(version: str) -> str:
+    """Backend a snapshot was built from (versions without SOURCE predate it: Postgres)."""
+    try:
+        return (_root / version / "SOURCE").read_text(encoding="utf-8").strip()
+    except FileNotFoundError:
+        return "postgres"
+
+
+def _usable(version: str) -> bool:
+    """Whether `version` holds what run_sql_pl would currently return."""
+    if _source(version) != config.SQL_BACKEND:
+        return False
+    if config.SQL_BACKEND == "local":
+        # Built before the CSVs last changed
+        return (_root / version).stat().st_mtime >= local_engine.data_mtime()
+    return True
+
+
+def read_table(table: str, lazy: bool | None = None) -> pl.DataFrame | pl.LazyFrame:
+    """
+    Whole `table` from the current snapshot, memory-mapped (zero-copy).
+
+    Same columns and dtypes as `run_sql_pl("SELECT * FROM <table>")`, which
+    is also what it falls back to (on config.SQL_BACKEND, so the local
+    backend needs no database) when there is no snapshot, when the current
+    one was built from the other backend, or, on the local backend, when
+    the data/raw CSVs changed after it was built. With `lazy=True`
+    (default: config.LAZY_EXEC) returns a `pl.LazyFrame`.
+    """
+    if table not in TABLES:
+        raise ValueError(f"Unknown table {table!r}; expected one of {TABLES}")
+    if lazy is None:
+        lazy = config.LAZY_EXEC
+
+    version = current_version()
+    if version is not None and not _usable(version):
+        version = None
+
+    if version is None:
+        df = _select_all(table, config.SQL_BACKEND)
+    else:
+        cached = _loaded.get(table)
+        if cached is not None and cached[0] == version:
+            df = cached[1]
+        else:
+            path = _root / version / f"{table}.arrow"
+            df = pl.read_ipc(path, memory_map=True, rechunk=False)
+            _loaded[table] = (version, df)
+
+    return df.lazy() if lazy else df
+
+
+if __name__ == "__main__":
+    print(f"Snapshot {build_snapshot()} written to {_root}")
@@ -0,0 +1,422 @@
+"""
+Sharded, resumable crawl of many repos.
+
+Repos are split across worker processes by a stable hash of their name.
+Each crawl is a run with its own directory, data/crawl/runs/<run id>.
+Every (repo, endpoint) pair keeps a checkpoint journal under the run's
+checkpoints/ recording each completed page, and each page's rows are
+written to the run's pages/ before the journal entry.
+
+A run ends when its pages are merged (de-duplicated) into the same
+data/raw CSVs that fetch_github_data writes, so load_to_postgres works
+unchanged. If any endpoint did not finish (crash, deploy, rate limit,
+error), data/raw is left as it was and the run stays open: the next
+invocation resumes it after the last completed page of each endpoint.
+Once a run is merged, the next invocation starts a new run with the
+current SINCE_DATE window. `--fresh` drops every run and starts over;
+`--allow-partial` merges (and ends the run) despite unfinished endpoints.
+
+    python -m github_pipeline.crawl [--workers N] [--fresh] [--merge-only] [--allow-partial]
+"""
+import argparse
+import hashlib
+import json
+import os
+import shutil
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Callable
+
+import polars as pl
+import requests
+
+from config import CRAWL_WORKERS, SINCE_DATE
+from github_pipeline.fetch_github_data import (
+    BASE_URL,
+    RAW_DIR,
+    RateLimited,
+    _gh_headers,
+    _paginate_pages,
+    _rate_limited,
+    commit_row,
+    issue_row,
+    pull_row,
+    repo_row,
+)
+from github_pipeline.repo_list import load_repo_list
+
+CRAWL_DIR = Path(__file__).parents[1] / "data" / "crawl"
+RUNS_DIR = CRAWL_DIR / "runs"
+
+
+@dataclass(frozen=True)
+class Endpoint:
+    path: str
+    params: dict
+    row: Callable[[str, dict], dict]
+    paginated: bool = True
+
+
+ENDPOINTS = {
+    "repo": Endpoint("", {}, lambda full_name, data: repo_row(data), paginated=False),
+    "issues": Endpoint("/issues", {"state": "all", "since": SINCE_DATE}, issue_row),
+    "pulls_open": Endpoint("/pulls", {"state": "open"}, pull_row),
+    "pulls_closed": Endpoint("/pulls", {"state": "closed"}, pull_row),
+    "commits": Endpoint("/commits", {"since": SINCE_DATE}, commit_row),
+}
+
+@dataclass(frozen=True)
+class Output:
+    endpoints: tuple[str, ...]  # endpoints whose pages it is built from
+    key: tuple[str, ...]  # unique key for de-duplication
+    columns: tuple[str, ...]  # as produced by the row builder
+
+
+_ITEM_COLUMNS = ("id", "repo_full_name", "number", "state", "created_at", "closed_at")
+
+# data/raw CSV -> how it is built
+OUTPUTS = {
+    "repos.csv": Output(
+        ("repo",),
+        ("full_name",),
+        ("full_name", "owner", "name", "stars", "forks", "open_issues", "watchers"),
+    ),
+    "issues.csv": Output(("issues",), ("id",), _ITEM_COLUMNS + ("is_pull_request",)),
+    "pulls.csv": Output(("pulls_open", "pulls_closed"), ("id",), _ITEM_COLUMNS + ("merged_at",)),
+    "commits.csv": Output(
+        ("commits",), ("repo_full_name", "sha"), ("repo_full_name", "sha", "committed_at")
+    ),
+}
+
+
+# ------------------------
+# Helpers
+# ------------------------
+def _slug(full_name: str) -> str:
+    return full_name.replace("/", "__")
+
+
+def _now() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
+
+def _fmt_duration(seconds: float) -> str:
+    seconds = int(seconds)
+    h, rem = divmod(seconds, 3600)
+    m, s = divmod(rem, 60)
+    return f"{h}h{m:02d}m{s:02d}s" if h else f"{m}m{s:02d}s"
+
+
+def shard_for(full_name: str, n_shards: int) -> int:
+    """Stable shard index (unlike hash(), identical across processes and runs)."""
+    digest = hashlib.sha1(full_name.lower().encode("utf-8")).hexdigest()
+    return int(digest, 16) % n_shards
+
+
+def _page_path(run_dir: Path, full_name: str, endpoint: str, page: int) -> Path:
+    return run_dir / "pages" / _slug(full_name) / endpoint / f"{page:05d}.json"
+
+
+def _write_page(run_dir: Path, full_name: str, endpoint: str, page: int, rows: list[dict]) -> None:
+    path = _page_path(run_dir, full_name, endpoint, page)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(".tmp")
+    tmp.write_text(json.dumps(rows), encoding="utf-8")
+    os.replace(tmp, path)
+
+
+# ------------------------
+# Runs
+# ------------------------
+def start_run(fresh: bool = False) -> Path:
+    """
+    Directory of the crawl run to work on: the latest run if it was never
+    merged (it was interrupted or left failures), else a new one.
+    """
+    if fresh and RUNS_DIR.exists():
+        shutil.rmtree(RUNS_DIR)
+
+    latest = latest_run()
+    if latest is not None and not (latest / "MERGED").exists():
+        print(f"Resuming crawl run {latest.name}")
+        return latest
+
+    run_dir = RUNS_DIR / datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+    run_dir.mkdir(parents=True)
+    print(f"Starting crawl run {run_dir.name}")
+    return run_dir
+
+
+def latest_run() -> Path | None:
+    runs = sorted(p for p in RUNS_DIR.glob("*") if p.is_dir()) if RUNS_DIR.exists() else []
+    return runs[-1] if runs else None
+
+
+def finish_run(run_dir: Path) -> None:
+    """Mark `run_dir` merged, so the next crawl starts a new run, and drop older runs."""
+    (run_dir / "MERGED").write_text(_now(), encoding="utf-8")
+    for p in RUNS_DIR.glob("*"):
+        if p.is_dir() and p != run_dir:
+            shutil.rmtree(p, ignore_errors=True)
+
+
+# ------------------------
+# Checkpoint journal
+# ------------------------
+class CheckpointJournal:
+    """
+    Append-only JSONL journal for one (repo, endpoint):
+
+        {"event": "start", "params": {...}, "at": ...}
+        {"event": "page", "page": 1, "rows": 100, "at": ...}
+        ...
+        {"event": "done", "at": ...}
+
+    Journals live in one crawl run's directory, so "done" only means done
+    for that run. The request params are recorded on the first attempt and
+    reused on resume, so page numbers keep meaning the same thing even if
+    SINCE_DATE has moved on since.
+    """
+
+    def __init__(self, run_dir: Path, full_name: str, endpoint: str):
+        self.path = run_dir / "checkpoints" / _slug(full_name) / f"{endpoint}.jsonl"
+        self.params: dict | None = None
+        self.last_page = 0
+        self.done = False
+        self._replay()
+
+    def _replay(self) -> None:
+        if not self.path.exists():
+            return
+        for line in self.path.read_text(encoding="utf-8").splitlines():
+            try:
+                entry = json.loads(line)
+            except json.JSONDecodeError:
+                # Torn last line from a crash mid-write; the page is redone
+                continue
+            if entry["event"] == "start":
+                self.params = entry["params"]
+            elif entry["event"] == "page":
+                self.last_page = max(self.last_page, entry["page"])
+            elif entry["event"] == "done":
+                self.done = True
+
+    def _append(self, entry: dict) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(entry | {"at": _now()}) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+
+    def start(self, params: dict) -> None:
+        if self.params is None:
+            self.params = params
+            self._append({"event": "start", "params": params})
+
+    def page_done(self, page: int, n_rows: int) -> None:
+        self.last_page = page
+        self._append({"event": "page", "page": page, "rows": n_rows})
+
+    def finish(self) -> None:
+        self.done = True
+        self._append({"event": "done"})
+
+
+# ------------------------
+# Crawling
+# ------------------------
+def crawl_endpoint(run_dir: Path, full_name: str, endpoint: str) -> int | None:
+    """
+    Crawl one (repo, endpoint), resuming after its last completed page.
+
+    Returns the number of rows fetched by this call, or None if the journal
+    says it was already complete in this run.
+    """
+    journal = CheckpointJournal(run_dir, full_name, endpoint)
+    if journal.done:
+        return None
+
+    ep = ENDPOINTS[endpoint]
+    journal.start(ep.params)
+    url = f"{BASE_URL}/repos/{full_name}{ep.path}"
+
+    if not ep.paginated:
+        r = requests.get(url, headers=_gh_headers())
+        if _rate_limited(r):
+            raise RateLimited(url)
+        r.raise_for_status()
+        _write_page(run_dir, full_name, endpoint, 1, [ep.row(full_name, r.json())])
+        journal.page_done(1, 1)
+        journal.finish()
+        return 1
+
+    n_rows = 0
+    pages = _paginate_pages(url, journal.params, start_page=journal.last_page + 1)
+    for page, items in pages:
+        rows = [ep.row(full_name, item) for item in items]
+        # Rows first, then the journal entry: a crash in between only redoes the page
+        _write_page(run_dir, full_name, endpoint, page, rows)
+        journal.page_done(page, len(rows))
+        n_rows += len(rows)
+
+    journal.finish()
+    return n_rows
+
+
+def crawl_shard(run_dir: Path, shard: int, n_shards: int, repos: list[str]) -> dict:
+    """Crawl every endpoint of `repos` in this process, printing progress and ETA."""
+    tag = f"[shard {shard + 1}/{n_shards}]"
+    units = [(full_name, endpoint) for full_name in repos for endpoint in ENDPOINTS]
+    total = len(units)
+    print(f"{tag} {len(repos)} repos, {total} (repo, endpoint) units", flush=True)
+
+    started = time.monotonic()
+    crawled = skipped = failed = rows = 0
+
+    for i, (full_name, endpoint) in enumerate(units, start=1):
+        try:
+            n = crawl_endpoint(run_dir, full_name, endpoint)
+        except RateLimited as e:
+            print(f"{tag} rate limited at {e}; stopping shard, rerun to resume.", flush=True)
+            failed += total - i + 1
+            break
+        except requests.RequestException as e:
+            print(f"{tag} {full_name} {endpoint} failed: {e}", flush=True)
+            failed += 1
+            continue
+
+        if n is None:
+            skipped += 1
+            continue
+
+        crawled += 1
+        rows += n
+        elapsed = time.monotonic() - started
+        remaining = total - i
+        eta = elapsed / crawled * remaining
+        print(
+            f"{tag} {i}/{total} ({i / total:.0%}) {full_name} {endpoint}: {n} rows | "
+            f"elapsed {_fmt_duration(elapsed)}, ETA {_fmt_duration(eta)}",
+            flush=True,
+        )
+
+    elapsed = time.monotonic() - started
+    print(
+        f"{tag} finished in {_fmt_duration(elapsed)}: {crawled} crawled, "
+        f"{skipped} already complete, {failed} failed, {rows} rows",
+        flush=True,
+    )
+    return {
+        "shard": shard,
+        "crawled": crawled,
+        "skipped": skipped,
+        "failed": failed,
+        "rows": rows,
+    }
+
+
+def run_crawl(run_dir: Path, repos: list[str], workers: int = CRAWL_WORKERS) -> list[dict]:
+    """Shard `repos` across `workers` processes and crawl them in parallel."""
+    n_shards = max(1, min(workers, len(repos)))
+    shards = [[] for _ in range(n_shards)]
+    for full_name in repos:
+        shards[shard_for(full_name, n_shards)].append(full_name)
+
+    with ProcessPoolExecutor(max_workers=n_shards) as pool:
+        futures = [
+            pool.submit(crawl_shard, run_dir, k, n_shards, shard_repos)
+            for k, shard_repos in enumerate(shards)
+            if shard_repos
+        ]
+        return [f.result() for f in futures]
+
+
+def merge_pages(run_dir: Path, repos: list[str]) -> None:
+    """
+    Combine the pages crawled for `repos` in `run_dir` into the data/raw CSVs.
+
+    The same item can be crawled twice: a PR that closes mid-crawl shows up
+    in both pulls_open and pulls_closed, and a resumed page of a `since`
+    listing can repeat items that shifted from an earlier page. Rows are
+    de-duplicated on each CSV's key, keeping the last (most recent) one,
+    so load_to_postgres does not hit primary-key conflicts.
+
+    An output with no crawled rows is written header-only, so CSVs from an
+    earlier repo list are never left next to this crawl's. Each CSV is
+    written to a temp file and renamed into place, so readers (e.g. the
+    local SQL backend) never see a half-written file.
+    """
+    RAW_DIR.mkdir(parents=True, exist_ok=True)
+    for csv_name, out in OUTPUTS.items():
+        rows = []
+        for full_name in repos:
+            for endpoint in out.endpoints:
+                ep_dir = run_dir / "pages" / _slug(full_name) / endpoint
+                for page_file in sorted(ep_dir.glob("*.json")):
+                    rows.extend(json.loads(page_file.read_text(encoding="utf-8")))
+
+        if rows:
+            df = (
+                pl.DataFrame(rows, infer_schema_length=None)
+                .select(out.columns)
+                .unique(subset=list(out.key), keep="last", maintain_order=True)
+            )
+        else:
+            df = pl.DataFrame(schema=dict.fromkeys(out.columns, pl.String))
+
+        path = RAW_DIR / csv_name
+        tmp = path.with_name(f".{csv_name}.tmp")
+        df.write_csv(tmp)
+        os.replace(tmp, path)
+        dropped = len(rows) - df.height
+        print(f"Wrote {df.height} rows to {path} ({dropped} duplicates dropped)")
+
+
+# ------------------------
+# Main entry point
+# ------------------------
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--workers", type=int, default=CRAWL_WORKERS)
+    parser.add_argument("--fresh", action="store_true", help="discard all runs and start over")
+    parser.add_argument(
+        "--merge-only",
+        action="store_true",
+        help="only rebuild CSVs from the latest run's pages",
+    )
+    parser.add_argument(
+        "--allow-partial",
+        action="store_true",
+        help="merge into data/raw even if some endpoints did not finish",
+    )
+    args = parser.parse_args()
+
+    repos = load_repo_list()
+    print(f"{len(repos)} repos to crawl")
+
+    if args.merge_only:
+        run_dir = latest_run()
+        if run_dir is None:
+            print("No crawl run to merge.")
+            return
+    else:
+        run_dir = start_run(fresh=args.fresh)
+        summaries = run_crawl(run_dir, repos, args.workers)
+        if any(s["failed"] for s in summaries) and not args.allow_partial:
+            # Keep the existing, complete data/raw CSVs rather than replacing
+            # them with a partial crawl; the run stays open for the next try
+            print(
+                "Some endpoints did not finish; data/raw left unchanged. "
+                "Rerun to resume this run, or pass --allow-partial."
+            )
+            return
+
+    merge_pages(run_dir, repos)
+    finish_run(run_dir)
+
+
+if __name__ == "__main__":
+    main()
@@ -25,16 +25,32 @@ def _gh_headers() -> dict:
     return headers
 
 
-def _paginate(url: str, params: dict):
+class RateLimited(Exception):
+    """GitHub's primary or secondary rate limit was hit."""
+
+
+def _rate_limited(r: requests.Response) -> bool:
     """
-    Generic GitHub pagination helper.
+    429, or 403 with no requests left / a Retry-After. Other 403s (org SSO,
+    blocked or inaccessible repos) are errors for that one request.
+    """
+    if r.status_code == 429:
+        return True
+    return r.status_code == 403 and (
+        r.headers.get("X-RateLimit-Remaining") == "0" or "Retry-After" in r.headers
+    )
+
+
+def _paginate_pages(url: str, params: dict, start_page: int = 1):
+    """
+    Yield (page_number, items) for each page, starting at `start_page`.
 
     - Handles normal pagination via Link headers.
-    - Gracefully stops on:
-      * 422 (pagination limit)
-      * 403 (rate limit exceeded)
+    - Stops on 422 (pagination limit).
+    - Raises RateLimited when rate limited so callers can decide whether to
+      resume later; any other error status raises requests.HTTPError.
     """
-    page = 1
+    page = start_page
     while True:
         p = params | {"per_page": 100, "page": page}
         r = requests.get(url, headers=_gh_headers(), params=p)
@@ -47,21 +63,15 @@ def _paginate(url: str, params: dict):
             )
             break
 
-        if r.status_code == 403:
-            print(
-                f"Stopping pagination for {url} at page {page}: "
-                "GitHub returned 403 (rate limit exceeded). "
-                "Stopping early; existing data is sufficient for analysis."
-            )
-            break
+        if _rate_limited(r):
+            raise RateLimited(f"{url} page {page}")
 
         r.raise_for_status()
         data = r.json()
         if not data:
             break
 
-        # Yield current page items
-        yield from data
+        yield page, data
 
         link_header = r.headers.get("Link", "")
         if 'rel="next"' not in link_header:
@@ -71,89 +81,124 @@ def _paginate(url: str, params: dict):
         time.sleep(0.2)  # be nice to the API
 
 
+def _paginate(url: str, params: dict):
+    """
+    Generic GitHub pagination helper.
+
+    - Handles normal pagination via Link headers.
+    - Gracefully stops on:
+      * 422 (pagination limit)
+      * 403 / 429 (rate limit exceeded, or no access)
+    """
+    page = 1
+    try:
+        for page, data in _paginate_pages(url, params):
+            # Yield current page items
+            yield from data
+    except RateLimited:
+        print(
+            f"Stopping pagination for {url} at page {page}: "
+            "GitHub rate limit exceeded. "
+            "Stopping early; existing data is sufficient for analysis."
+        )
+    except requests.HTTPError as e:
+        if e.response is None or e.response.status_code != 403:
+            raise
+        print(f"Stopping pagination for {url} at page {page}: GitHub returned 403 (no access).")
+
+
+# ------------------------
+# Row builders (shared with github_pipeline.crawl)
+# ------------------------
+def repo_row(data: dict) -> dict:
+    return {
+        "full_name": data["full_name"],
+        "owner": data["owner"]["login"],
+        "name": data["name"],
+        "stars": data["stargazers_count"],
+        "forks": data["forks_count"],
+        "open_issues": data["open_issues_count"],
+        "watchers": data["subscribers_count"],
+    }
+
+
+def issue_row(full_name: str, issue: dict) -> dict:
+    return {
+        "id": issue["id"],
+        "repo_full_name": full_name,
+        "number": issue["number"],
+        "state": issue["state"],
+        "created_at": issue["created_at"],
+        "closed_at": issue.get("closed_at"),
+        "is_pull_request": "pull_request" in issue,
+    }
+
+
+def pull_row(full_name: str, pr: dict) -> dict:
+    return {
+        "id": pr["id"],
+        "repo_full_name": full_name,
+        "number": pr["number"],
+        "state": pr["state"],
+        "created_at": pr["created_at"],
+        "closed_at": pr.get("closed_at"),
+        "merged_at": pr.get("merged_at"),
+    }
+
+
+def commit_row(full_name: str, commit: dict) -> dict:
+    return {
+        "repo_full_name": full_name,
+        "sha": commit["sha"],
+        "committed_at": commit["commit"]["author"]["date"],
+    }
+
+
 # ------------------------
 # Fetch functions
 # ------------------------
-def fetch_repo_metadata() -> pl.DataFrame:
+def fetch_repo_metadata(repos: list[str] | None = None) -> pl.DataFrame:
     rows = []
-    for full_name in GITHUB_REPOS:
+    for full_name in repos or GITHUB_REPOS:
         url = f"{BASE_URL}/repos/{full_name}"
         r = requests.get(url, headers=_gh_headers())
         r.raise_for_status()
-        data = r.json()
-        rows.append(
-            {
-                "full_name": data["full_name"],
-                "owner": data["owner"]["login"],
-                "name": data["name"],
-                "stars": data["stargazers_count"],
-                "forks": data["forks_count"],
-                "open_issues": data["open_issues_count"],
-                "watchers": data["subscribers_count"],
-            }
-        )
+        rows.append(repo_row(r.json()))
     df = pl.DataFrame(rows)
     df.write_csv(RAW_DIR / "repos.csv")
     return df
 
 
-def fetch_issues() -> pl.DataFrame:
+def fetch_issues(repos: list[str] | None = None) -> pl.DataFrame:
     rows = []
-    for full_name in GITHUB_REPOS:
+    for full_name in repos or GITHUB_REPOS:
         url = f"{BASE_URL}/repos/{full_name}/issues"
         for issue in _paginate(url, {"state": "all", "since": SINCE_DATE}):
-            is_pr = "pull_request" in issue
-            rows.append(
-                {
-                    "id": issue["id"],
-                    "repo_full_name": full_name,
-                    "number": issue["number"],
-                    "state": issue["state"],
-                    "created_at": issue["created_at"],
-                    "closed_at": issue.get("closed_at"),
-                    "is_pull_request": is_pr,
-                }
-            )
+            rows.append(issue_row(full_name, issue))
     df = pl.DataFrame(rows)
     df.write_csv(RAW_DIR / "issues.csv")
     return df
 
 
-def fetch_pulls() -> pl.DataFrame:
+def fetch_pulls(repos: list[str] | None = None) -> pl.DataFrame:
     rows = []
-    for full_name in GITHUB_REPOS:
+    for full_name in repos or GITHUB_REPOS:
         url = f"{BASE_URL}/repos/{full_name}/pulls"
         # We'll call twice: open + closed
         for state in ("open", "closed"):
             for pr in _paginate(url, {"state": state}):
-                rows.append(
-                    {
-                        "id": pr["id"],
-                        "repo_full_name": full_name,
-                        "number": pr["number"],
-                        "state": pr["state"],
-                        "created_at": pr["created_at"],
-                        "closed_at": pr.get("closed_at"),
-                        "merged_at": pr.get("merged_at"),
-                    }
-                )
+                rows.append(pull_row(full_name, pr))
     df = pl.DataFrame(rows)
     df.write_csv(RAW_DIR / "pulls.csv")
     return df
 
 
-def fetch_commits() -> pl.DataFrame:
+def fetch_commits(repos: list[str] | None = None) -> pl.DataFrame:
     rows = []
-    for full_name in GITHUB_REPOS:
+    for full_name in repos or GITHUB_REPOS:
         url = f"{BASE_URL}/repos/{full_name}/commits"
         for commit in _paginate(url, {"since": SINCE_DATE}):
-            rows.append(
-                {
-                    "repo_full_name": full_name,
-                    "sha": commit["sha"],
-                    "committed_at": commit["commit"]["author"]["date"],
-                }
-            )
+            rows.append(commit_row(full_name, commit))
     df = pl.DataFrame(rows)
     df.write_csv(RAW_DIR / "commits.csv")
     return df
@@ -163,19 +208,23 @@ def fetch_commits() -> pl.DataFrame:
 # Main entry point
 # ------------------------
 def main():
+    # Imported here: repo_list itself uses the helpers above
+    from github_pipeline.repo_list import load_repo_list
+
     RAW_DIR.mkdir(parents=True, exist_ok=True)
+    repos = load_repo_list()
 
     print("Fetching repo metadata...")
-    fetch_repo_metadata()
+    fetch_repo_metadata(repos)
 
     print("Fetching issues...")
-    fetch_issues()
+    fetch_issues(repos)
 
     print("Fetching pulls...")
-    fetch_pulls()
+    fetch_pulls(repos)
 
     print("Fetching commits...")
-    fetch_commits()
+    fetch_commits(repos)
 
     print(f"Done. CSVs written to {RAW_DIR}")
 
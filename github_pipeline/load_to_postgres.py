@@ -4,6 +4,7 @@ import pandas as pd
 from sqlalchemy import text
 
 from db.connection import get_engine, init_db
+from db.snapshot import build_snapshot
 
 RAW_DIR = Path(__file__).parents[1] / "data" / "raw"
 
@@ -14,6 +15,28 @@ def load_table(df: pd.DataFrame, table: str):
         df.to_sql(table, con=conn, if_exists="append", index=False)
 
 
+def repo_ids() -> dict[str, int]:
+    """Map repos.full_name -> repos.id for the repos already loaded."""
+    engine = get_engine()
+    with engine.connect() as conn:
+        rows = conn.execute(text("SELECT full_name, id FROM repos")).fetchall()
+    return {full_name: repo_id for full_name, repo_id in rows}
+
+
+def with_repo_id(df: pd.DataFrame, ids: dict[str, int]) -> pd.DataFrame:
+    """
+    Replace the repo_full_name TEXT column with the integer repos.id FK
+    used by the *_data storage tables. Rows for unknown repos are dropped.
+    """
+    df = df.assign(repo_id=df["repo_full_name"].map(ids))
+    missing = df["repo_id"].isna()
+    if missing.any():
+        unknown = sorted(df.loc[missing, "repo_full_name"].unique())
+        print(f"Skipping {int(missing.sum())} rows for repos not in repos.csv: {unknown}")
+        df = df[~missing]
+    return df.drop(columns=["repo_full_name"]).astype({"repo_id": "int64"})
+
+
 def main():
     init_db()
 
@@ -26,12 +49,18 @@ def main():
     issues = issues[issues["is_pull_request"] == False]  # noqa: E712
 
     load_table(repos, "repos")
-    load_table(issues, "issues")
-    load_table(pulls, "pulls")
-    load_table(commits, "commits")
+    ids = repo_ids()
+
+    # issues / pulls / commits are views over the *_data tables (see schema.sql)
+    load_table(with_repo_id(issues, ids), "issues_data")
+    load_table(with_repo_id(pulls, ids), "pulls_data")
+    load_table(with_repo_id(commits, ids), "commits_data")
 
     print("Loaded all tables into Postgres.")
 
+    version = build_snapshot("postgres")
+    print(f"Built Arrow snapshot {version}.")
+
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,114 @@
+import time
+from pathlib import Path
+
+import requests
+
+from config import (
+    GITHUB_DISCOVERY_LIMIT,
+    GITHUB_ORGS,
+    GITHUB_REPOS,
+    GITHUB_REPOS_FILE,
+    GITHUB_TOPICS,
+)
+from github_pipeline.fetch_github_data import BASE_URL, _gh_headers, _paginate
+
+
+# ------------------------
+# Sources
+# ------------------------
+def repos_from_file(path: str | Path) -> list[str]:
+    """Read "owner/repo" names, one per line; blank lines and '#' comments are ignored."""
+    repos = []
+    for line in Path(path).read_text(encoding="utf-8").splitlines():
+        name = line.split("#", 1)[0].strip()
+        if name:
+            repos.append(name)
+    return repos
+
+
+def repos_for_org(org: str, limit: int = GITHUB_DISCOVERY_LIMIT) -> list[str]:
+    """Public, non-archived, non-fork repos owned by `org`."""
+    repos = []
+    url = f"{BASE_URL}/orgs/{org}/repos"
+    for repo in _paginate(url, {"type": "public", "sort": "pushed"}):
+        if repo.get("archived") or repo.get("fork"):
+            continue
+        repos.append(repo["full_name"])
+        if len(repos) >= limit:
+            break
+    return repos
+
+
+def repos_for_topic(
+    topic: str,
+    org: str | None = None,
+    limit: int = GITHUB_DISCOVERY_LIMIT,
+) -> list[str]:
+    """
+    Repos tagged with `topic` (optionally restricted to `org`), most starred first.
+
+    The search API wraps results in {"items": [...]} and caps them at 1000,
+    so it is paged here rather than through `_paginate`.
+    """
+    q = f"topic:{topic} archived:false" + (f" org:{org}" if org else "")
+    url = f"{BASE_URL}/search/repositories"
+    repos = []
+    page = 1
+    while len(repos) < limit and page <= 10:
+        r = requests.get(
+            url,
+            headers=_gh_headers(),
+            params={"q": q, "sort": "stars", "order": "desc", "per_page": 100, "page": page},
+        )
+        if r.status_code in (403, 422):
+            print(f"Stopping topic search {q!r} at page {page}: GitHub returned {r.status_code}.")
+            break
+        r.raise_for_status()
+        items = r.json().get("items", [])
+        repos.extend(item["full_name"] for item in items)
+        if len(items) < 100:
+            break
+        page += 1
+        time.sleep(2)  # search API allows ~30 requests/minute
+    return repos[:limit]
+
+
+# ------------------------
+# Combined list
+# ------------------------
+def load_repo_list() -> list[str]:
+    """
+    Repos to crawl, de-duplicated in first-seen order:
+
+    - GITHUB_REPOS_FILE entries,
+    - repos of each org in GITHUB_ORGS (only those with a matching topic
+      when GITHUB_TOPICS is also set),
+    - repos for each topic in GITHUB_TOPICS when no orgs are set.
+
+    Falls back to config.GITHUB_REPOS when none of those are configured.
+    """
+    repos: list[str] = []
+
+    if GITHUB_REPOS_FILE:
+        repos += repos_from_file(GITHUB_REPOS_FILE)
+
+    if GITHUB_ORGS:
+        for org in GITHUB_ORGS:
+            if GITHUB_TOPICS:
+                for topic in GITHUB_TOPICS:
+                    repos += repos_for_topic(topic, org=org)
+            else:
+                repos += repos_for_org(org)
+    else:
+        for topic in GITHUB_TOPICS:
+            repos += repos_for_topic(topic)
+
+    if not (GITHUB_REPOS_FILE or GITHUB_ORGS or GITHUB_TOPICS):
+        repos = list(GITHUB_REPOS)
+
+    return list(dict.fromkeys(repos))
+
+
+if __name__ == "__main__":
+    for name in load_repo_list():
+        print(name)
@@ -19,7 +19,9 @@ if "OPENAI_API_KEY" not in os.environ:
     if "OPENAI_API_KEY" in st.secrets:
         os.environ["OPENAI_API_KEY"] = st.secrets["OPENAI_API_KEY"]
 
+import config
 from agentic.workflow import build_graph
+from db.connection import get_pool_metrics, warm_up_pool
 
 
 
@@ -236,6 +238,22 @@ if "graph" not in st.session_state:
     st.session_state.graph = build_graph()
 
 
+@st.cache_resource
+def _warm_db_pool():
+    # Once per server process: open pooled connections before the first question
+    try:
+        warm_up_pool()
+    except Exception as e:
+        st.warning(f"Could not warm up the database pool: {e}")
+
+
+if config.SQL_BACKEND == "postgres":
+    _warm_db_pool()
+
+with st.sidebar.expander("🔌 DB pool metrics", expanded=False):
+    st.json(get_pool_metrics())
+
+
 # ------------------ Code Extractor ------------------
 
 def extract_code_from_messages(messages):
@@ -0,0 +1,65 @@
+import polars as pl
+import pytest
+
+from db.local_engine import _alias_aggregates
+
+
+@pytest.mark.parametrize(
+    "query, expected",
+    [
+        ("SELECT COUNT(*) FROM repos", "SELECT COUNT(*) AS count FROM repos"),
+        ("SELECT COUNT(*)FROM repos", "SELECT COUNT(*) AS count FROM repos"),
+        (
+            "SELECT owner, AVG(stars), MAX(forks) FROM repos GROUP BY owner",
+            "SELECT owner, AVG(stars) AS avg, MAX(forks) AS max FROM repos GROUP BY owner",
+        ),
+        (
+            "SELECT DISTINCT count(DISTINCT owner) FROM repos",
+            "SELECT DISTINCT count(DISTINCT owner) AS count FROM repos",
+        ),
+        (
+            "WITH x AS (SELECT * FROM repos) SELECT COUNT(*) FROM x",
+            "WITH x AS (SELECT * FROM repos) SELECT COUNT(*) AS count FROM x",
+        ),
+        (
+            "WITH a (n) AS (SELECT COUNT(*) FROM repos), b AS (SELECT 1) SELECT SUM(n) FROM a",
+            "WITH a (n) AS (SELECT COUNT(*) FROM repos), b AS (SELECT 1) SELECT SUM(n) AS sum FROM a",
+        ),
+    ],
+)
+def test_bare_aggregates_get_postgres_names(query, expected):
+    assert _alias_aggregates(query) == expected
+
+
+@pytest.mark.parametrize(
+    "query",
+    [
+        # Compound expressions are "?column?" in Postgres, not the first aggregate's name
+        "SELECT COUNT(*) * 1.0 / SUM(stars) FROM repos",
+        "SELECT MAX(created_at) - MIN(created_at) FROM issues",
+        "SELECT COUNT(*) FILTER (WHERE stars > 10) FROM repos",
+        # Already named
+        "SELECT COUNT(*) AS n FROM repos",
+        "SELECT COUNT(*) n FROM repos",
+        # Two aggregates would share a name
+        "SELECT MAX(stars), MAX(forks) FROM repos",
+        # No aggregates, or not a SELECT
+        "SELECT owner FROM repos",
+        "SHOW TABLES",
+        "WITH x AS (SELECT COUNT(*) FROM repos) SELECT * FROM x",
+    ],
+)
+def test_other_queries_are_left_alone(query):
+    assert _alias_aggregates(query) == query
+
+
+def test_quoted_text_is_not_parsed():
+    query = "SELECT COUNT(*) FROM repos WHERE name = 'from (x'"
+    assert _alias_aggregates(query) == "SELECT COUNT(*) AS count FROM repos WHERE name = 'from (x'"
+
+
+def test_column_names_match_postgres():
+    ctx = pl.SQLContext(repos=pl.DataFrame({"owner": ["a", "a", "b"], "stars": [1, 2, 3]}))
+    query = "SELECT owner, COUNT(*), AVG(stars), COUNT(*) * 1.0 / SUM(stars) FROM repos GROUP BY owner"
+    df = ctx.execute(_alias_aggregates(query), eager=True)
+    assert df.columns[:3] == ["owner", "count", "avg"]